@@ -2,19 +2,45 @@ import argparse
 import json
 try:
     import yaml
+    try:
+        # Prefer the libyaml-backed emitter when PyYAML was built with it
+        from yaml import CSafeDumper as _YamlDumper
+    except ImportError:
+        from yaml import SafeDumper as _YamlDumper
     _HAS_YAML = True
 except Exception:
     yaml = None
+    _YamlDumper = None
     _HAS_YAML = False
+try:
+    import orjson
+    _HAS_ORJSON = True
+except Exception:
+    orjson = None
+    _HAS_ORJSON = False
 import logging
+import math
+import multiprocessing
 import os
 import re
 import shutil
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
+import gzip
 import hashlib
+import struct
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+# Concurrent emblem downloads (see prefetch_emblems); the session's connection
+# pool is sized to match so every worker keeps a warm keep-alive connection
+EMBLEM_DOWNLOAD_WORKERS = 32
+
 # HTTP session reused for downloads; set a permissive User-Agent to reduce 403s
 _HTTP_SESSION = None
 try:
@@ -22,6 +48,14 @@ try:
     _HTTP_SESSION.headers.update({
         "User-Agent": "Mozilla/5.0 (compatible; sevensuns/1.0; +https://github.com)"
     })
+    # Retry dropped connections and transient server errors with a short
+    # backoff rather than losing the emblem on the first failure
+    _http_adapter = HTTPAdapter(
+        pool_connections=EMBLEM_DOWNLOAD_WORKERS, pool_maxsize=EMBLEM_DOWNLOAD_WORKERS,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+    )
+    _HTTP_SESSION.mount("http://", _http_adapter)
+    _HTTP_SESSION.mount("https://", _http_adapter)
 except Exception:
     _HTTP_SESSION = None
 
@@ -35,6 +69,59 @@ MFCG_MATCH_PATTERN = None
 MFCG_MAP_FILE = None
 MFCG_DEDUPE = False
 MFCG_ZIP = False
+# Optional MarkdownSink that batches Markdown writes (set up by __main__)
+MARKDOWN_SINK = None
+# Worker processes used to render cells (0 = one per CPU); maps smaller than
+# PARALLEL_MIN_CELLS are rendered in-process since pool startup would dominate
+WORKERS = 0
+PARALLEL_MIN_CELLS = 20000
+# Skip cells with no elevation, burg, state, culture or routes (open ocean)
+SKIP_EMPTY_CELLS = False
+
+# Frontmatter is written by `_fast_yaml_dump`; set FMG_PYYAML_FRONTMATTER=1 to
+# emit it through PyYAML instead (useful for validating the fast writer).
+_USE_PYYAML = _HAS_YAML and os.environ.get("FMG_PYYAML_FRONTMATTER") == "1"
+
+# Plain YAML scalars containing these characters (or starting with whitespace,
+# a digit, or another indicator) are double-quoted so readers keep them as strings
+_YAML_QUOTE_RE = re.compile(
+    r"[\x00-\x1f\x7f-\x9f\u2028\u2029\ufeff\ufffe\uffff:#\"\\\[\]{}&*!|>%@`]"
+    r"|^[\s'\-?.+0-9~=,]|\s$"
+)
+_YAML_RESERVED = frozenset(("", "~", "<<", "null", "true", "false", "yes", "no", "on", "off"))
+# Characters json.dumps(ensure_ascii=False) leaves as-is but YAML readers
+# reject or treat as line breaks; they are written as \uXXXX escapes instead
+_YAML_ESCAPE_RE = re.compile("[\x7f-\x9f\u2028\u2029\ufeff\ufffe\uffff]")
+
+# (emblem dir, blake2b digest) of every SVG emblem written -> vault-relative path
+_svg_hash_cache = {}
+# (emblem dir, source path) of every local emblem copied -> vault-relative path
+_local_emblem_cache = {}
+# (type, id, url) -> result of an emblem download done by prefetch_emblems
+_prefetched_emblems = {}
+# (path, mtime, size) of the MFCG mapping file -> its parsed contents
+_mfcg_map_cache = {}
+# pack keys of the entity lists that carry emblems, with their emblem type
+_EMBLEM_CATEGORIES = (
+    ("burgs", "burg"), ("states", "state"), ("provinces", "province"),
+    ("cultures", "culture"), ("religions", "religion"), ("features", "feature"),
+)
+
+class _FilenameTable(dict):
+    """str.translate table mapping every character outside [A-Za-z0-9._-] to '_'.
+
+    Entries are filled in on first lookup, so the table only ever holds the
+    characters that actually occur in entity names.
+    """
+
+    def __missing__(self, code):
+        value = code if code < 128 and (chr(code).isalnum() or chr(code) in "._-") else ord("_")
+        self[code] = value
+        return value
+
+
+# Used by safe_filename, which runs once per named entity
+_FILENAME_TABLE = _FilenameTable()
 
 def ensure_vault_dirs(outdir):
     folders = [
@@ -44,31 +131,320 @@ def ensure_vault_dirs(outdir):
     for folder in folders:
         os.makedirs(os.path.join(outdir, folder), exist_ok=True)
 
+def _yaml_scalar(v):
+    """Return the scalar `v` formatted as a single-line YAML scalar."""
+    if v is None:
+        return "null"
+    if v is True:
+        return "true"
+    if v is False:
+        return "false"
+    if isinstance(v, int):
+        return str(v)
+    if isinstance(v, float):
+        if v != v:
+            return ".nan"
+        if v in (float("inf"), float("-inf")):
+            return ".inf" if v > 0 else "-.inf"
+        s = repr(v)
+        # YAML 1.1 floats need a dot before the exponent (1e-05 -> 1.0e-05)
+        if "e" in s and "." not in s:
+            s = s.replace("e", ".0e", 1)
+        return s
+    s = str(v)
+    if _YAML_QUOTE_RE.search(s) or s.lower() in _YAML_RESERVED:
+        return _yaml_escape(json.dumps(s, ensure_ascii=False))
+    return s
+
+
+def _yaml_escape(text):
+    """Escape the characters in `_YAML_ESCAPE_RE` inside JSON-encoded text."""
+    if _YAML_ESCAPE_RE.search(text) is None:
+        return text
+    return _YAML_ESCAPE_RE.sub(lambda m: "\\u%04x" % ord(m.group()), text)
+
+
+def _yaml_float(v):
+    """`_yaml_scalar` for a float, skipping its type dispatch in the common case.
+
+    Only exponents ("1e-05") and nan/inf, whose reprs contain "e" or "n",
+    need YAML-specific spelling.
+    """
+    s = repr(v)
+    if "e" in s or "n" in s:
+        return _yaml_scalar(v)
+    return s
+
+
+def _json_flow(value):
+    """Return a list/dict as a compact, JSON-style YAML flow collection.
+
+    Strings, ints, booleans and null are spelled as JSON would spell them.
+    Floats go through `_yaml_scalar` so collections use the same YAML 1.1
+    spelling as top-level values (1.0e-05, .nan, .inf); plain JSON floats
+    like 1e16 or NaN would read back as strings. Other objects become their
+    str().
+    """
+    if isinstance(value, dict):
+        return "{%s}" % ",".join(
+            f"{_json_flow_key(k)}:{_json_flow(v)}" for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        # long id lists (feature/river cells) are usually plain ints
+        if all(type(v) is int for v in value):
+            return "[%s]" % ",".join(map(str, value))
+        return "[%s]" % ",".join(map(_json_flow, value))
+    if isinstance(value, str):
+        return _yaml_escape(json.dumps(value, ensure_ascii=False))
+    if value is None or isinstance(value, (bool, int, float)):
+        return _yaml_scalar(value)
+    return _yaml_escape(json.dumps(str(value), ensure_ascii=False))
+
+
+def _json_flow_key(key):
+    # JSON only has string keys; convert others the way json.dumps does
+    if not isinstance(key, str):
+        if key is None or isinstance(key, bool):
+            key = _yaml_scalar(key)
+        else:
+            key = str(key)
+    return _yaml_escape(json.dumps(key, ensure_ascii=False))
+
+
+def _fast_yaml_dump(fm):
+    """Serialize a frontmatter dict to YAML.
+
+    Scalars become plain (or double-quoted) YAML scalars and lists/dicts are
+    written inline as JSON, so no value goes through PyYAML's representers.
+    """
+    out = []
+    for k, v in fm.items():
+        if isinstance(v, (list, tuple, dict)):
+            out.append(f"{_yaml_scalar(k)}: {_json_flow(v)}\n")
+        else:
+            out.append(f"{_yaml_scalar(k)}: {_yaml_scalar(v)}\n")
+    return "".join(out)
+
+
+def render_markdown(frontmatter, body):
+    """Return the UTF-8 bytes of a Markdown file with YAML frontmatter + body.
+
+    Frontmatter is serialized with `_fast_yaml_dump`. PyYAML is only used when
+    FMG_PYYAML_FRONTMATTER=1 is set in the environment.
+    """
+    yaml_text = None
+    if _USE_PYYAML:
+        try:
+            yaml_text = yaml.dump(frontmatter, Dumper=_YamlDumper, sort_keys=False, default_flow_style=False)
+            # PyYAML may append '...'; strip if present
+            if yaml_text.endswith("...\n"):
+                yaml_text = yaml_text[:-4]
+        except Exception:
+            yaml_text = None
+    if yaml_text is None:
+        yaml_text = _fast_yaml_dump(frontmatter)
+    return f"---\n{yaml_text}---\n\n{body}".encode("utf-8")
+
+
 def write_markdown(path, frontmatter, body):
     """Write a Markdown file with YAML frontmatter + body.
 
-    If PyYAML is available it will be used to produce valid YAML. Otherwise
-    falls back to the previous `repr()` formatting for compatibility.
+    When a `MarkdownSink` is active the rendered file is queued on it instead
+    of being written immediately.
     """
-    with open(path, "w", encoding="utf-8") as f:
-        f.write("---\n")
-        if _HAS_YAML:
-            try:
-                # Use safe_dump to avoid non-YAML types; keep block style
-                yaml_text = yaml.safe_dump(frontmatter, sort_keys=False, default_flow_style=False)
-                # PyYAML may append '...'; strip if present and ensure newline
-                if yaml_text.endswith("...\n"):
-                    yaml_text = yaml_text[:-4]
-                f.write(yaml_text)
-            except Exception:
-                # Fall back to repr if yaml.dump fails for unexpected types
-                for k, v in frontmatter.items():
-                    f.write(f"{k}: {repr(v)}\n")
+    write_markdown_bytes(path, render_markdown(frontmatter, body))
+
+
+def write_markdown_bytes(path, payload):
+    """Write an already rendered Markdown file (queued on the sink if active)."""
+    if MARKDOWN_SINK is not None:
+        MARKDOWN_SINK.submit(path, payload)
+        return
+    _write_file_bytes(path, payload)
+
+
+def _write_file_bytes(path, payload):
+    """Write `payload` to `path` with a single open/write/close."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _flush_markdown_files(batch):
+    """Write a batch of files; return the OSErrors of the ones that failed."""
+    errors = []
+    for path, payload in batch:
+        try:
+            _write_file_bytes(path, payload)
+        except OSError as e:
+            logging.warning("Failed to write %s: %s", path, e)
+            errors.append(e)
+    return errors
+
+
+class MarkdownSink:
+    """Collect rendered Markdown files and write them in batches.
+
+    `submit` only queues (path, payload) pairs in memory. Once `max_bytes` are
+    pending the batch is split into one slice per writer thread, so the
+    processors keep formatting while earlier files hit the disk and the pool
+    pays its scheduling cost per slice rather than per file. Use it as a
+    context manager: leaving the block flushes the last batch and waits for
+    every write to finish. Failed writes are logged as they happen and
+    `close` then raises, so a run that lost notes does not exit cleanly.
+    """
+
+    def __init__(self, max_bytes=4 * 1024 * 1024, max_workers=None):
+        self.max_bytes = max_bytes
+        # cells and entities are processed on separate threads (see process_pack)
+        self._lock = threading.Lock()
+        self._workers = max_workers or os.cpu_count() or 4
+        self._executor = ThreadPoolExecutor(max_workers=self._workers)
+        self._pending = []
+        self._pending_bytes = 0
+        self._in_flight = []
+        self._errors = []
+
+    def submit(self, path, payload):
+        with self._lock:
+            self._pending.append((path, payload))
+            self._pending_bytes += len(payload)
+            if self._pending_bytes >= self.max_bytes:
+                self._flush_locked()
+
+    def flush(self):
+        """Hand pending files to the writer threads.
+
+        Waits for the previous batch first so at most two batches are held in
+        memory at a time.
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        batch = self._pending
+        self._pending = []
+        self._pending_bytes = 0
+        self._collect_in_flight()
+        step = -(-len(batch) // self._workers)
+        self._in_flight = [
+            self._executor.submit(_flush_markdown_files, batch[i:i + step])
+            for i in range(0, len(batch), step)
+        ]
+
+    def _collect_in_flight(self):
+        # .result() re-raises anything other than OSError from a writer thread
+        futures = self._in_flight
+        self._in_flight = []
+        for future in futures:
+            self._errors.extend(future.result())
+
+    def close(self):
+        try:
+            with self._lock:
+                self._flush_locked()
+                self._collect_in_flight()
+        finally:
+            self._executor.shutdown(wait=True)
+        if self._errors:
+            raise OSError(f"Failed to write {len(self._errors)} Markdown file(s); first error: {self._errors[0]}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.close()
+        except Exception as e:
+            # don't mask the exception already leaving the with block
+            if exc_type is None:
+                raise
+            logging.error("Markdown sink failed while closing: %s", e)
+        return False
+
+
+# Bundle record header: UTF-8 path length, payload length (little-endian u32)
+_BUNDLE_HEADER = struct.Struct("<II")
+
+
+class BundleSink:
+    """Write rendered Markdown files into one gzip bundle instead of the vault.
+
+    A drop-in replacement for MarkdownSink (`--bundle`): every submitted file
+    becomes a length-prefixed record of its vault-relative path and payload in
+    a single compressed stream, so a large map produces one file instead of
+    tens of thousands. `unpack_bundle` recreates the Markdown files. Emblems
+    and MFCG assets are still written to the vault directly.
+    """
+
+    def __init__(self, bundle_path, vault_dir=None, compresslevel=1):
+        self._root = os.path.join(vault_dir or VAULT_DIR, "")
+        self._lock = threading.Lock()
+        self._out = gzip.open(bundle_path, "wb", compresslevel=compresslevel)
+
+    def submit(self, path, payload):
+        if path.startswith(self._root):
+            rel = path[len(self._root):]
         else:
-            for k, v in frontmatter.items():
-                f.write(f"{k}: {repr(v)}\n")
-        f.write("---\n\n")
-        f.write(body)
+            rel = os.path.relpath(path, self._root)
+        rel = rel.replace("\\", "/").encode("utf-8")
+        with self._lock:
+            self._out.write(_BUNDLE_HEADER.pack(len(rel), len(payload)))
+            self._out.write(rel)
+            self._out.write(payload)
+
+    def flush(self):
+        with self._lock:
+            self._out.flush()
+
+    def close(self):
+        with self._lock:
+            self._out.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def unpack_bundle(bundle_path, outdir):
+    """Extract the Markdown files of a `BundleSink` bundle into `outdir`.
+
+    Returns the number of files written.
+    """
+    outdir = os.path.abspath(outdir)
+    made_dirs = set()
+    count = 0
+    with gzip.open(bundle_path, "rb") as f:
+        while True:
+            header = f.read(_BUNDLE_HEADER.size)
+            if not header:
+                break
+            if len(header) < _BUNDLE_HEADER.size:
+                raise ValueError(f"Truncated bundle record in {bundle_path}")
+            path_len, payload_len = _BUNDLE_HEADER.unpack(header)
+            rel = f.read(path_len).decode("utf-8")
+            payload = f.read(payload_len)
+            if len(payload) < payload_len:
+                raise ValueError(f"Truncated bundle record in {bundle_path}")
+            path = os.path.normpath(os.path.join(outdir, rel))
+            if os.path.commonpath((outdir, path)) != outdir:
+                raise ValueError(f"Bundle entry escapes the output directory: {rel}")
+            parent = os.path.dirname(path)
+            if parent not in made_dirs:
+                os.makedirs(parent, exist_ok=True)
+                made_dirs.add(parent)
+            _write_file_bytes(path, payload)
+            count += 1
+    return count
 
 
 def safe_filename(name: str, fallback: str = "unnamed") -> str:
@@ -78,25 +454,28 @@ def safe_filename(name: str, fallback: str = "unnamed") -> str:
     """
     if not name:
         return fallback
-    s = str(name)
-    # Replace whitespace with underscore, then remove characters outside allowed set
-    s = re.sub(r"\s+", "_", s)
-    s = re.sub(r"[^A-Za-z0-9._-]", "_", s)
-    s = s.strip("_-")
-    return s or fallback
+    return _sanitize_filename(str(name)) or fallback
 
 
-def _get_list_item(lst, idx, default=None):
-    """Safely get `lst[idx]` returning `default` if out-of-range or not a list."""
-    try:
-        if isinstance(lst, dict):
-            # dict keyed by indices
-            return lst.get(idx, default)
-        if lst is None:
-            return default
-        return lst[idx] if 0 <= idx < len(lst) else default
-    except Exception:
-        return default
+# Culture, state and feature-type names repeat across many entities
+@lru_cache(maxsize=None)
+def _sanitize_filename(s):
+    # Collapse whitespace runs to one underscore, then replace characters
+    # outside the allowed set
+    return "_".join(s.split()).translate(_FILENAME_TABLE).strip("_-")
+
+
+def load_json(path):
+    """Parse the JSON file at `path`, using orjson when it is installed.
+
+    FMG exports are dominated by long numeric arrays, which orjson parses
+    several times faster than the stdlib `json` module.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if _HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 def _safe_cast(val, caster, default=None):
@@ -107,15 +486,50 @@ def _safe_cast(val, caster, default=None):
 
 
 def save_emblem_svg(obj_type, obj_id, svg_data):
+    """Write an embedded SVG emblem and return its vault-relative path.
+
+    FMG often reuses the same coat of arms for many entities, so identical
+    SVGs are only written once; later entities reuse the first file's path.
+    """
+    if isinstance(svg_data, str):
+        data = svg_data.encode("utf-8")
+    elif isinstance(svg_data, bytes):
+        data = svg_data
+    else:
+        logging.warning("Ignoring non-text SVG emblem for %s %s", obj_type, obj_id)
+        return ""
+    key = (EMBLEM_DIR, hashlib.blake2b(data, digest_size=16).digest())
+    cached = _svg_hash_cache.get(key)
+    if cached:
+        return cached
     filename = f"{obj_type}-{obj_id}.svg"
     path = os.path.join(EMBLEM_DIR, filename)
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(svg_data)
-        return f"emblems/{filename}"
+        # the UTF-8 bytes are already at hand from hashing; write them directly
+        _write_file_bytes(path, data)
     except OSError as e:
         logging.warning("Failed to write SVG emblem %s: %s", path, e)
         return ""
+    rel = f"emblems/{filename}"
+    _svg_hash_cache[key] = rel
+    return rel
+
+
+def _emblem_ext(src):
+    """Extension used for the saved copy of an emblem path or URL (text after the last dot)."""
+    return str(src).rsplit(".", 1)[-1]
+
+
+_NO_SVG = object()
+
+
+def _coa_svg(obj):
+    """Return `obj["coa"]["svg"]`, or `_NO_SVG` if the entity has no embedded SVG."""
+    # One lookup chain; missing keys and non-dict values both land in except
+    try:
+        return obj["coa"]["svg"]
+    except (KeyError, TypeError, IndexError):
+        return _NO_SVG
 
 
 def get_emblem_for(obj_type, obj, obj_id):
@@ -126,19 +540,65 @@ def get_emblem_for(obj_type, obj, obj_id):
     """
     try:
         # embedded SVG from COA
-        coa = obj.get("coa") if isinstance(obj, dict) else None
-        if isinstance(coa, dict) and "svg" in coa:
-            return save_emblem_svg(obj_type, obj_id, coa["svg"])
+        svg = _coa_svg(obj)
+        if svg is not _NO_SVG:
+            return save_emblem_svg(obj_type, obj_id, svg)
 
         # external emblem URL or local path
         emblem_src = obj.get("emblem_url") if isinstance(obj, dict) else None
         if emblem_src:
-            ext = str(emblem_src).split(".")[-1]
-            return save_emblem_image(emblem_src, obj_type, obj_id, ext, download=DOWNLOAD_EMBLEMS)
+            prefetched = _prefetched_emblems.get((obj_type, obj_id, emblem_src))
+            if prefetched is not None:
+                return prefetched
+            return save_emblem_image(emblem_src, obj_type, obj_id, _emblem_ext(emblem_src), download=DOWNLOAD_EMBLEMS)
     except Exception as e:
         logging.warning("Failed to resolve emblem for %s %s: %s", obj_type, obj_id, e)
     return ""
 
+def prefetch_emblems(pack):
+    """Download every HTTP(S) emblem in `pack` concurrently.
+
+    Emblem downloads are latency-bound, so fetching them one at a time while
+    the processors run serializes every round trip. This collects the URLs
+    the processors would download (entities without an embedded `coa.svg`)
+    and fetches them on a thread pool up front; `get_emblem_for` then returns
+    the stored results instead of downloading again.
+    """
+    jobs = []
+    for key, obj_type in _EMBLEM_CATEGORIES:
+        items = pack.get(key)
+        if not isinstance(items, list):
+            continue
+        for obj in items[1:]:
+            if not isinstance(obj, dict):
+                continue
+            if _coa_svg(obj) is not _NO_SVG:
+                continue
+            url = obj.get("emblem_url")
+            if isinstance(url, str) and url.startswith(("http://", "https://")):
+                jobs.append((obj_type, obj.get("i", "unknown"), url))
+    if not jobs:
+        return
+
+    def fetch(job):
+        obj_type, obj_id, url = job
+        try:
+            return save_emblem_image(url, obj_type, obj_id, _emblem_ext(url), download=True)
+        except Exception as e:
+            # One bad download must not take the others (or the run) with it
+            logging.warning("Failed to fetch emblem %s for %s %s: %s", url, obj_type, obj_id, e)
+            return ""
+
+    # Download each URL once; entities sharing a URL reuse the first file
+    first_jobs = {}
+    for job in jobs:
+        first_jobs.setdefault(job[2], job)
+    with ThreadPoolExecutor(max_workers=EMBLEM_DOWNLOAD_WORKERS) as pool:
+        results = dict(zip(first_jobs, pool.map(fetch, first_jobs.values())))
+    for job in jobs:
+        _prefetched_emblems[job] = results[job[2]]
+
+
 def save_emblem_image(src_path, obj_type, obj_id, ext="png", download=False):
     filename = f"{obj_type}-{obj_id}.{ext}"
     dst_path = os.path.join(EMBLEM_DIR, filename)
@@ -151,52 +611,169 @@ def save_emblem_image(src_path, obj_type, obj_id, ext="png", download=False):
             sess = _HTTP_SESSION or requests
             resp = sess.get(src_path, stream=True, timeout=10)
             resp.raise_for_status()
-            # Ensure emblem dir exists
-            os.makedirs(EMBLEM_DIR, exist_ok=True)
+            # EMBLEM_DIR is created up front by ensure_vault_dirs. Stream the
+            # raw body in 1 MiB reads instead of a Python loop over 8 KiB
+            # iter_content chunks; decode_content keeps gzip/deflate handling.
+            resp.raw.decode_content = True
             with open(dst_path, "wb") as out_file:
-                for chunk in resp.iter_content(chunk_size=8192):
-                    if chunk:
-                        out_file.write(chunk)
+                shutil.copyfileobj(resp.raw, out_file, length=1024 * 1024)
             return f"emblems/{filename}"
         except requests.RequestException as e:
             logging.warning("Failed to download emblem %s: %s", src_path, e)
             return ""
+        except Urllib3HTTPError as e:
+            # Reading resp.raw directly skips requests' wrapping, so dropped
+            # connections and bad encodings surface as urllib3 errors here
+            logging.warning("Failed to download emblem %s: %s", src_path, e)
+            try:
+                os.remove(dst_path)
+            except OSError:
+                pass
+            return ""
+        except OSError as e:
+            logging.warning("Failed to write downloaded emblem %s: %s", dst_path, e)
+            return ""
 
     # Otherwise expect a local path
     try:
-        # If source path is already the destination, avoid copying / duplication
-        abs_dst = os.path.abspath(dst_path)
-        try:
-            abs_src = os.path.abspath(src_path)
-        except Exception:
-            abs_src = None
-
-        # If source and destination are the same file, reuse it
-        if abs_src and abs_src == abs_dst:
-            logging.debug("Source emblem is already at destination: %s", abs_src)
+        # If the source already is the destination file in the emblem folder,
+        # reuse it (no copy) to avoid duplicate files. That is only possible
+        # when the filenames match, so the paths are resolved only then.
+        if os.path.basename(src_path) == filename and os.path.abspath(src_path) == os.path.abspath(dst_path):
+            logging.debug("Source emblem is already at destination: %s", src_path)
             return f"emblems/{filename}"
 
-        # If the source already lives in the emblem folder and has the same basename,
-        # reuse it (no copy) to avoid duplicate files.
-        try:
-            emblem_dir_abs = os.path.abspath(EMBLEM_DIR)
-            if abs_src and os.path.dirname(abs_src) == emblem_dir_abs and os.path.basename(abs_src) == filename:
-                logging.debug("Source emblem already in emblem dir: %s", abs_src)
-                return f"emblems/{filename}"
-        except Exception:
-            pass
-
+        # Entities sharing one local emblem file reuse the first copy
+        key = (EMBLEM_DIR, src_path)
+        cached = _local_emblem_cache.get(key)
+        if cached:
+            return cached
         if not os.path.exists(src_path):
             logging.warning("Local emblem file not found: %s", src_path)
             return ""
-        shutil.copy(src_path, dst_path)
-        return f"emblems/{filename}"
+        # copyfile uses os.sendfile on Linux (fcopyfile on macOS) and skips the
+        # permission-bit copy that shutil.copy does
+        shutil.copyfile(src_path, dst_path)
+        rel = f"emblems/{filename}"
+        _local_emblem_cache[key] = rel
+        return rel
     except (OSError, TypeError) as e:
         logging.warning("Failed to copy emblem %s -> %s: %s", src_path, dst_path, e)
         return ""
 
 
-def integrate_mfcg_assets(burg_id, burg_name, mfcg_root, outdir):
+def scan_mfcg_root(mfcg_root):
+    """List `mfcg_root` once for `integrate_mfcg_assets`.
+
+    Returns `(name, name.lower(), abs_path, is_dir, is_file)` tuples built
+    from a single os.scandir pass, or an empty list if the folder is missing.
+    """
+    src_root = os.path.abspath(mfcg_root)
+    entries = []
+    try:
+        with os.scandir(src_root) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                    is_file = entry.is_file()
+                except OSError:
+                    is_dir = is_file = False
+                entries.append((entry.name, entry.name.lower(), entry.path, is_dir, is_file))
+    except OSError as e:
+        logging.debug("Could not list MFCG root %s: %s", src_root, e)
+    return entries
+
+
+def index_mfcg_entries(entries):
+    """Map each lowercased name in a `scan_mfcg_root` listing to its positions."""
+    index = {}
+    for pos, entry in enumerate(entries):
+        index.setdefault(entry[1], []).append(pos)
+    return index
+
+
+def _load_mfcg_map(map_file):
+    """Return the parsed MFCG mapping file, or None if it does not exist.
+
+    The mapping is consulted once per burg, so it is parsed once and reused
+    until the file's size or modification time changes.
+    """
+    map_path = os.path.abspath(map_file)
+    try:
+        st = os.stat(map_path)
+    except OSError:
+        return None
+    key = (map_path, st.st_mtime_ns, st.st_size)
+    mapping = _mfcg_map_cache.get(key)
+    if mapping is None:
+        mapping = load_json(map_path)
+        _mfcg_map_cache.clear()
+        _mfcg_map_cache[key] = mapping
+    return mapping
+
+
+def _iter_files(top):
+    """Yield the paths of all files under `top`, in os.walk's top-down order.
+
+    An explicit os.scandir stack: file/dir checks come from the directory
+    entries themselves, and only the paths are produced (no per-directory
+    name lists). Like os.walk, symlinked directories are not descended into
+    and unreadable directories are skipped.
+    """
+    stack = [top]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        yield entry.path
+                    elif not entry.is_symlink():
+                        subdirs.append(entry.path)
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+
+def _copy_mfcg_dir(src, dest_sub, outdir):
+    """Copy the MFCG folder `src` to `dest_sub` and list its files.
+
+    An existing `dest_sub` is reused without copying. Returns the vault-relative
+    paths of the files under `dest_sub`, always listed from the destination so
+    a fresh copy and a later rerun report them in the same order.
+    """
+    if os.path.exists(dest_sub):
+        logging.debug("MFCG dest already exists, skipping copy: %s", dest_sub)
+    else:
+        try:
+            # copyfile keeps the sendfile fast path and skips the per-file
+            # chmod/utime that copy2 (copytree's default) adds
+            shutil.copytree(src, dest_sub, copy_function=shutil.copyfile)
+        except Exception:
+            # fallback: copy files inside
+            os.makedirs(dest_sub, exist_ok=True)
+            for root, dirs, files in os.walk(src):
+                # walk in a stable name order so reruns copy files the same way
+                dirs.sort()
+                rel = os.path.relpath(root, src)
+                target_root = os.path.join(dest_sub, rel) if rel != '.' else dest_sub
+                os.makedirs(target_root, exist_ok=True)
+                for f in sorted(files):
+                    shutil.copyfile(os.path.join(root, f), os.path.join(target_root, f))
+    return [os.path.relpath(p, outdir).replace('\\', '/') for p in _iter_files(dest_sub)]
+
+
+@lru_cache(maxsize=16)
+def _compile_mfcg_pattern(pattern):
+    # --mfcg-match-pattern is fixed for a run; compile it once for all burgs
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def integrate_mfcg_assets(burg_id, burg_name, mfcg_root, outdir, entries=None, index=None):
     """Find and copy MFCG outputs that match a burg into the vault.
 
     Strategy:
@@ -204,6 +781,11 @@ def integrate_mfcg_assets(burg_id, burg_name, mfcg_root, outdir):
     - If found, copy their contents into `outdir/Burgs/Burg-<id>-<safe_name>/mfcg/<folder>`
     - If no matching folders, search for files in `mfcg_root` that contain the id or safe name and copy them into the per-burg mfcg folder.
 
+    `entries` is the listing from `scan_mfcg_root`; callers handling many
+    burgs pass it so the folder is scanned once instead of twice per burg.
+    In 'exact' mode an `index` from `index_mfcg_entries` narrows the listing
+    to the entries named after this burg without comparing every name.
+
     Returns a list of vault-relative paths to the copied files (empty list if none).
     """
     try:
@@ -214,27 +796,38 @@ def integrate_mfcg_assets(burg_id, burg_name, mfcg_root, outdir):
             logging.debug("MFCG root not found: %s", src_root)
             return []
 
+        if entries is None:
+            entries = scan_mfcg_root(src_root)
+
         safe_name = safe_filename(burg_name)
+        # Match tokens are built once per burg, not per entry; the regex is
+        # compiled once per run by _compile_mfcg_pattern
+        safe_low = safe_name.lower()
+        id_str = str(burg_id)
+        burg_token = f"burg-{burg_id}"
+        exact_names = {burg_token, id_str, safe_low, f"{burg_token}-{safe_low}"}
+        pattern = None
+        if MFCG_MATCH_MODE == 'regex' and MFCG_MATCH_PATTERN:
+            try:
+                pattern = _compile_mfcg_pattern(MFCG_MATCH_PATTERN)
+            except re.error as e:
+                logging.debug("Invalid MFCG match pattern %r: %s", MFCG_MATCH_PATTERN, e)
+        if MFCG_MATCH_MODE == 'exact' and index is not None:
+            entries = [entries[pos] for pos in sorted(pos for name in exact_names for pos in index.get(name, ()))]
         candidates = []
         # look for matching directories using selected match mode
-        for entry in os.listdir(src_root):
-            entry_low = entry.lower()
+        for entry, entry_low, entry_path, entry_is_dir, _ in entries:
             match_ok = False
             if MFCG_MATCH_MODE == 'fuzzy':
-                match_ok = (entry_low in (f"burg-{burg_id}", str(burg_id), safe_name.lower()) or
-                            f"burg-{burg_id}" in entry_low or safe_name.lower() in entry_low)
+                # exact burg-<id>/safe-name matches are covered by the substring tests
+                match_ok = entry_low == id_str or burg_token in entry_low or safe_low in entry_low
             elif MFCG_MATCH_MODE == 'exact':
-                match_ok = entry_low in (f"burg-{burg_id}", str(burg_id), safe_name.lower(), f"burg-{burg_id}-{safe_name.lower()}")
-            elif MFCG_MATCH_MODE == 'regex' and MFCG_MATCH_PATTERN:
-                try:
-                    if re.search(MFCG_MATCH_PATTERN, entry, flags=re.IGNORECASE):
-                        match_ok = True
-                except re.error:
-                    match_ok = False
+                match_ok = entry_low in exact_names
+            elif pattern is not None:
+                match_ok = pattern.search(entry) is not None
             # in 'map' mode we will rely on the provided mapping file instead of filename matching
-            if match_ok:
-                cand = os.path.join(src_root, entry)
-                candidates.append(cand)
+            if match_ok and entry_is_dir:
+                candidates.append(entry_path)
 
         dest_base = os.path.join(outdir, "Burgs", f"Burg-{burg_id}-{safe_name}", "mfcg")
         os.makedirs(dest_base, exist_ok=True)
@@ -243,42 +836,19 @@ def integrate_mfcg_assets(burg_id, burg_name, mfcg_root, outdir):
         existing_hashes = {}
         if MFCG_DEDUPE:
             try:
-                for root, _, files in os.walk(outdir):
-                    for f in files:
-                        p = os.path.join(root, f)
-                        try:
-                            h = hashlib.sha256(open(p, 'rb').read()).hexdigest()
-                            existing_hashes[h] = os.path.relpath(p, outdir).replace('\\', '/')
-                        except Exception:
-                            continue
+                for p in _iter_files(outdir):
+                    try:
+                        h = hashlib.sha256(open(p, 'rb').read()).hexdigest()
+                        existing_hashes[h] = os.path.relpath(p, outdir).replace('\\', '/')
+                    except Exception:
+                        continue
             except Exception:
                 existing_hashes = {}
 
         # If candidate directories exist, copy them (preserve inner structure)
         for c in candidates:
-            if os.path.isdir(c):
-                # copy folder contents into subfolder named after the source
-                dest_sub = os.path.join(dest_base, os.path.basename(c))
-                # If dest_sub exists, use it; otherwise copytree
-                if os.path.exists(dest_sub):
-                    logging.debug("MFCG dest already exists, skipping copy: %s", dest_sub)
-                else:
-                    try:
-                        shutil.copytree(c, dest_sub)
-                    except Exception:
-                        # fallback: copy files inside
-                        os.makedirs(dest_sub, exist_ok=True)
-                        for root, dirs, files in os.walk(c):
-                            rel = os.path.relpath(root, c)
-                            target_root = os.path.join(dest_sub, rel) if rel != '.' else dest_sub
-                            os.makedirs(target_root, exist_ok=True)
-                            for f in files:
-                                shutil.copy(os.path.join(root, f), os.path.join(target_root, f))
-                # Collect vault-relative paths
-                for root, _, files in os.walk(dest_sub):
-                    for f in files:
-                        rel = os.path.relpath(os.path.join(root, f), outdir).replace('\\', '/')
-                        copied.append(rel)
+            # copy folder contents into subfolder named after the source
+            copied.extend(_copy_mfcg_dir(c, os.path.join(dest_base, os.path.basename(c)), outdir))
 
         # Also try file matches at root (do this even if directories copied so
         # we include both kinds of assets when present). Behavior depends on
@@ -287,31 +857,15 @@ def integrate_mfcg_assets(burg_id, burg_name, mfcg_root, outdir):
         # If using a mapping file, resolve explicit targets first
         if MFCG_MATCH_MODE == 'map' and MFCG_MAP_FILE:
             try:
-                map_path = os.path.abspath(MFCG_MAP_FILE)
-                if os.path.exists(map_path):
-                    with open(map_path, 'r', encoding='utf-8') as mf:
-                        mapping = json.load(mf)
+                mapping = _load_mfcg_map(MFCG_MAP_FILE)
+                if mapping is not None:
                     targets = mapping.get(str(burg_id)) or mapping.get(str(burg_id).lower()) or mapping.get(safe_name) or mapping.get(safe_name.lower())
                     if isinstance(targets, (list, tuple)):
                         for t in targets:
                             abs_src = os.path.join(src_root, t)
                             if os.path.isdir(abs_src):
                                 dest_sub = os.path.join(dest_base, os.path.basename(abs_src))
-                                if not os.path.exists(dest_sub):
-                                    try:
-                                        shutil.copytree(abs_src, dest_sub)
-                                    except Exception:
-                                        os.makedirs(dest_sub, exist_ok=True)
-                                        for root, _, files in os.walk(abs_src):
-                                            rel = os.path.relpath(root, abs_src)
-                                            target_root = os.path.join(dest_sub, rel) if rel != '.' else dest_sub
-                                            os.makedirs(target_root, exist_ok=True)
-                                            for f in files:
-                                                shutil.copy(os.path.join(root, f), os.path.join(target_root, f))
-                                for root, _, files in os.walk(dest_sub):
-                                    for f in files:
-                                        rel = os.path.relpath(os.path.join(root, f), outdir).replace('\\', '/')
-                                        copied.append(rel)
+                                copied.extend(_copy_mfcg_dir(abs_src, dest_sub, outdir))
                             elif os.path.isfile(abs_src):
                                 # dedupe by hash
                                 try:
@@ -324,7 +878,7 @@ def integrate_mfcg_assets(burg_id, burg_name, mfcg_root, outdir):
                                     dst = os.path.join(dest_base, os.path.basename(abs_src))
                                     try:
                                         os.makedirs(os.path.dirname(dst), exist_ok=True)
-                                        shutil.copy(abs_src, dst)
+                                        shutil.copyfile(abs_src, dst)
                                         rel = os.path.relpath(dst, outdir).replace('\\', '/')
                                         copied.append(rel)
                                         if src_hash:
@@ -335,22 +889,17 @@ def integrate_mfcg_assets(burg_id, burg_name, mfcg_root, outdir):
                 logging.debug("Failed to load MFCG map file %s: %s", MFCG_MAP_FILE, e)
 
         # Generic file matching for fuzzy/exact/regex modes
-        for entry in os.listdir(src_root):
-            entry_low = entry.lower()
-            abs_src = os.path.join(src_root, entry)
-            if not os.path.isfile(abs_src):
+        for entry, entry_low, abs_src, _, entry_is_file in entries:
+            if not entry_is_file:
                 continue
             match_ok = False
             if MFCG_MATCH_MODE == 'fuzzy':
-                match_ok = (f"burg-{burg_id}" in entry_low) or (str(burg_id) in entry_low) or (safe_name.lower() in entry_low)
+                # "burg-<id>" contains the id, so one substring test covers both
+                match_ok = id_str in entry_low or safe_low in entry_low
             elif MFCG_MATCH_MODE == 'exact':
-                match_ok = entry_low in (f"burg-{burg_id}", str(burg_id), safe_name.lower(), f"burg-{burg_id}-{safe_name.lower()}")
-            elif MFCG_MATCH_MODE == 'regex' and MFCG_MATCH_PATTERN:
-                try:
-                    if re.search(MFCG_MATCH_PATTERN, entry, flags=re.IGNORECASE):
-                        match_ok = True
-                except re.error:
-                    match_ok = False
+                match_ok = entry_low in exact_names
+            elif pattern is not None:
+                match_ok = pattern.search(entry) is not None
 
             if not match_ok:
                 continue
@@ -368,7 +917,7 @@ def integrate_mfcg_assets(burg_id, burg_name, mfcg_root, outdir):
             dst = os.path.join(dest_base, entry)
             try:
                 os.makedirs(os.path.dirname(dst), exist_ok=True)
-                shutil.copy(abs_src, dst)
+                shutil.copyfile(abs_src, dst)
                 rel = os.path.relpath(dst, outdir).replace('\\', '/')
                 copied.append(rel)
                 if src_hash:
@@ -408,56 +957,166 @@ def integrate_mfcg_assets(burg_id, burg_name, mfcg_root, outdir):
         logging.warning("Unexpected error integrating MFCG assets for %s: %s", burg_id, e)
         return []
 
+# Per-cell columns in `pack["cells"]`, in the order `_render_cell` unpacks
+# them, with the type each is coerced to and its default for missing values
+_CELL_COLUMNS = (
+    ("x", float, 0.0), ("y", float, 0.0), ("h", int, 0), ("f", int, 0),
+    ("biome", int, 0), ("burg", int, 0), ("culture", int, 0), ("state", int, 0),
+    ("province", int, 0), ("religion", int, 0), ("pop", float, 0.0),
+    ("r", int, 0), ("fl", int, 0), ("harbor", int, 0),
+)
+
+
+def _cell_column(cells, key, n, caster, default):
+    """Return `cells[key]` as `n` values coerced with `caster`.
+
+    Missing entries are padded with `default`. The whole column is converted
+    with one `map()` call; only a column containing a bad value falls back to
+    casting item by item, and even then finite floats (and ints in an int
+    column) skip `_safe_cast`.
+    """
+    col = cells.get(key)
+    if isinstance(col, dict):
+        # dict keyed by indices
+        col = [col.get(i, default) for i in range(n)]
+    elif not isinstance(col, (list, tuple)):
+        return [default] * n
+    elif len(col) < n:
+        col = list(col) + [default] * (n - len(col))
+    elif len(col) > n:
+        col = col[:n]
+    try:
+        return list(map(caster, col))
+    except Exception:
+        return [
+            caster(v) if (type(v) is int and caster is int) or (type(v) is float and math.isfinite(v))
+            else _safe_cast(v, caster, default)
+            for v in col
+        ]
+
+
+def _cell_routes(cells, n):
+    routes = cells.get("routes", {})
+    if isinstance(routes, dict):
+        return [routes.get(i, {}) for i in range(n)]
+    if isinstance(routes, list):
+        return routes[:n] + [{}] * (n - len(routes))
+    return [{}] * n
+
+
+# Frontmatter for a cell has a fixed set of keys, so it is rendered from one
+# precompiled template instead of walking a dict through `_fast_yaml_dump`;
+# the body's link list is likewise a constant template filled with %-formatting
+_CELL_FRONTMATTER = (
+    "---\n"
+    "cell_id: %d\n"
+    "x: %s\n"
+    "y: %s\n"
+    "elevation: %d\n"
+    "feature: %d\n"
+    "biome: %d\n"
+    "burg: %d\n"
+    "culture: %d\n"
+    "state: %d\n"
+    "province: %d\n"
+    "religion: %d\n"
+    "population: %s\n"
+    "river: %d\n"
+    "flux: %d\n"
+    "harbor_score: %d\n"
+    "%s"
+    "---\n\n"
+)
+_CELL_BODY = (
+    "# Cell %d\n"
+    "Links → [[Features/Feature-%d]], "
+    "[[Cultures/Culture-%d]], [[States/State-%d]], "
+    "[[Provinces/Province-%d]], [[Religions/Religion-%d]], "
+    "[[Rivers/River-%d]], [[Burgs/Burg-%d]]"
+)
+
+
+def _render_cell(row):
+    """Render one cell row to a `(cell_id, payload)` pair.
+
+    Rows come from the coerced columns built in `process_cells`, so every
+    field already has its final type and nothing here can fail per cell.
+    """
+    cid, x, y, h, f, biome, burg, culture, state, province, religion, pop, r, fl, harbor, routes = row
+    body = _CELL_BODY % (cid, f, culture, state, province, religion, r, burg)
+    if _USE_PYYAML:
+        fm = {
+            "cell_id": cid, "x": x, "y": y, "elevation": h, "feature": f,
+            "biome": biome, "burg": burg, "culture": culture, "state": state,
+            "province": province, "religion": religion, "population": pop,
+            "river": r, "flux": fl, "harbor_score": harbor, "routes": routes,
+        }
+        return cid, render_markdown(fm, body)
+    frontmatter = _CELL_FRONTMATTER % (
+        cid, _yaml_float(x), _yaml_float(y), h, f, biome, burg, culture,
+        state, province, religion, _yaml_float(pop), r, fl, harbor,
+        "routes: {}\n" if routes == {} else _fast_yaml_dump({"routes": routes}),
+    )
+    return cid, (frontmatter + body).encode("utf-8")
+
+
+def _cell_is_empty(row):
+    """True for a cell row with zero elevation and no burg, culture, state or routes."""
+    cid, x, y, h, f, biome, burg, culture, state, province, religion, pop, r, fl, harbor, routes = row
+    return not (h or burg or culture or state or routes)
+
+
 def process_cells(pack):
     cells = pack.get("cells", {})
     # Some packs may provide `cells` as a list of heights instead of a dict
     if isinstance(cells, list):
         cells = {"h": cells}
-    heights = cells.get("h", [])
-    for cid, elev in enumerate(heights):
-        try:
-            fm = {
-                "cell_id": cid,
-                "x": _safe_cast(_get_list_item(cells.get("x", []), cid, 0), float, 0.0),
-                "y": _safe_cast(_get_list_item(cells.get("y", []), cid, 0), float, 0.0),
-                "elevation": _safe_cast(elev, int, 0),
-                "feature": _safe_cast(_get_list_item(cells.get("f", []), cid, 0), int, 0),
-                "biome": _safe_cast(_get_list_item(cells.get("biome", []), cid, 0), int, 0),
-                "burg": _safe_cast(_get_list_item(cells.get("burg", []), cid, 0), int, 0),
-                "culture": _safe_cast(_get_list_item(cells.get("culture", []), cid, 0), int, 0),
-                "state": _safe_cast(_get_list_item(cells.get("state", []), cid, 0), int, 0),
-                "province": _safe_cast(_get_list_item(cells.get("province", []), cid, 0), int, 0),
-                "religion": _safe_cast(_get_list_item(cells.get("religion", []), cid, 0), int, 0),
-                "population": _safe_cast(_get_list_item(cells.get("pop", []), cid, 0.0), float, 0.0),
-                "river": _safe_cast(_get_list_item(cells.get("r", []), cid, 0), int, 0),
-                "flux": _safe_cast(_get_list_item(cells.get("fl", []), cid, 0), int, 0),
-                "harbor_score": _safe_cast(_get_list_item(cells.get("harbor", []), cid, 0), int, 0),
-                "routes": {},
-            }
-            routes = cells.get("routes", {})
-            if isinstance(routes, dict):
-                fm["routes"] = routes.get(cid, {})
-            elif isinstance(routes, list):
-                fm["routes"] = _get_list_item(routes, cid, {})
-            else:
-                fm["routes"] = {}
-        except Exception as e:
-            logging.warning("Skipping cell %s due to error: %s", cid, e)
-            continue
-        body = (
-            f"# Cell {fm['cell_id']}\n"
-            f"Links → [[Features/Feature-{fm['feature']}]], "
-            f"[[Cultures/Culture-{fm['culture']}]], [[States/State-{fm['state']}]], "
-            f"[[Provinces/Province-{fm['province']}]], [[Religions/Religion-{fm['religion']}]], "
-            f"[[Rivers/River-{fm['river']}]], [[Burgs/Burg-{fm['burg']}]]"
-        )
-        path = os.path.join(VAULT_DIR, "Cells", f"Cell-{cid}.md")
-        write_markdown(path, fm, body)
+    n_cells = len(cells.get("h", []))
+    # The pack is already column-oriented: coerce each column once (padded to
+    # the cell count) and zip them into rows instead of looking up and
+    # casting every field per cell
+    columns = [_cell_column(cells, key, n_cells, caster, default) for key, caster, default in _CELL_COLUMNS]
+    rows = zip(range(n_cells), *columns, _cell_routes(cells, n_cells))
+    if SKIP_EMPTY_CELLS:
+        rows = (row for row in rows if not _cell_is_empty(row))
+    # Resolve the output directory and filename prefix once; workers only
+    # send back the cell id with the rendered bytes
+    out_prefix = os.path.join(VAULT_DIR, "Cells", "Cell-")
+    workers = WORKERS or os.cpu_count() or 1
+    if workers > 1 and n_cells >= PARALLEL_MIN_CELLS:
+        # Formatting is pure-Python CPU work, so spread it over processes and
+        # keep all file I/O (and the sink's batching) in this process. The
+        # spawn context behaves the same on every OS and never forks the
+        # sink's writer threads.
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(workers) as pool:
+            for cid, payload in pool.imap_unordered(_render_cell, rows, chunksize=1024):
+                write_markdown_bytes(f"{out_prefix}{cid}.md", payload)
+        return
+    for row in rows:
+        cid, payload = _render_cell(row)
+        write_markdown_bytes(f"{out_prefix}{cid}.md", payload)
+
+# Entity note bodies, filled with %-formatting like `_CELL_BODY`
+_BURG_BODY = (
+    "# Burg %s\n"
+    "%s\n"
+    "Located in [[Cells/Cell-%s]]\n"
+    "Culture → [[Cultures/Culture-%s]]\n"
+    "State → [[States/State-%s]]\n"
+    "Feature → [[Features/Feature-%s]]"
+)
+
 
 def process_burgs(burgs):
     if not isinstance(burgs, list):
         logging.warning("burgs is not a list; skipping burg processing")
         return
+    out_prefix = os.path.join(VAULT_DIR, "Burgs", "Burg-")
+    # List the MFCG folder once for all burgs
+    use_mfcg = isinstance(MFCG_DIR, str) and bool(MFCG_DIR)
+    mfcg_entries = scan_mfcg_root(MFCG_DIR) if use_mfcg else []
+    mfcg_index = index_mfcg_entries(mfcg_entries) if MFCG_MATCH_MODE == 'exact' else None
     for b in burgs[1:]:  # skip element 0
         try:
             if not isinstance(b, dict):
@@ -485,20 +1144,14 @@ def process_burgs(burgs):
             logging.warning("Skipping burg entry due to error: %s", e)
             continue
         # Integrate Medieval Fantasy City Generator (MFCG) assets, if a source dir was provided
-        mfcg_assets = []
-        try:
-            if isinstance(MFCG_DIR, str) and MFCG_DIR:
-                mfcg_assets = integrate_mfcg_assets(fm['burg_id'], fm['name'], MFCG_DIR, VAULT_DIR)
-        except Exception:
-            logging.debug("MFCG asset integration failed for burg %s", fm.get('burg_id'))
-
-        body = (
-            f"# Burg {fm['name']}\n"
-            f"{f'![Emblem]({fm['emblem_url']})' if fm['emblem_url'] else ''}\n"
-            f"Located in [[Cells/Cell-{fm['cell']}]]\n"
-            f"Culture → [[Cultures/Culture-{fm['culture']}]]\n"
-            f"State → [[States/State-{fm['state']}]]\n"
-            f"Feature → [[Features/Feature-{fm['feature']}]]"
+        # (integrate_mfcg_assets logs and swallows its own errors)
+        mfcg_assets = integrate_mfcg_assets(
+            fm['burg_id'], fm['name'], MFCG_DIR, VAULT_DIR, mfcg_entries, mfcg_index
+        ) if use_mfcg else []
+
+        body = _BURG_BODY % (
+            fm['name'], f"![Emblem]({emblem_url})" if emblem_url else "",
+            fm['cell'], fm['culture'], fm['state'], fm['feature'],
         )
         # Append links to any integrated MFCG assets
         if mfcg_assets:
@@ -509,14 +1162,22 @@ def process_burgs(burgs):
             fm['mfcg_assets'] = mfcg_assets
         else:
             fm['mfcg_assets'] = []
-        filename = f"Burg-{fm['burg_id']}-{safe_filename(fm['name'])}.md"
-        path = os.path.join(VAULT_DIR, "Burgs", filename)
+        path = f"{out_prefix}{fm['burg_id']}-{safe_filename(fm['name'])}.md"
         write_markdown(path, fm, body)
 
+_STATE_BODY = (
+    "# State %s\n"
+    "%s\n"
+    "Culture → [[Cultures/Culture-%s]]\n"
+    "Capital → [[Burgs/Burg-%s]]"
+)
+
+
 def process_states(states):
     if not isinstance(states, list):
         logging.warning("states is not a list; skipping state processing")
         return
+    out_prefix = os.path.join(VAULT_DIR, "States", "State-")
     for s in states[1:]:
         try:
             if not isinstance(s, dict):
@@ -537,20 +1198,25 @@ def process_states(states):
         except Exception as e:
             logging.warning("Skipping state entry due to error: %s", e)
             continue
-        body = (
-            f"# State {fm['name']}\n"
-            f"{f'![Emblem]({fm['emblem_url']})' if fm['emblem_url'] else ''}\n"
-            f"Culture → [[Cultures/Culture-{fm['culture']}]]\n"
-            f"Capital → [[Burgs/Burg-{fm['capital_burg']}]]"
+        body = _STATE_BODY % (
+            fm['name'], f"![Emblem]({emblem_url})" if emblem_url else "", fm['culture'], fm['capital_burg'],
         )
-        filename = f"State-{fm['state_id']}-{safe_filename(fm['name'])}.md"
-        path = os.path.join(VAULT_DIR, "States", filename)
+        path = f"{out_prefix}{fm['state_id']}-{safe_filename(fm['name'])}.md"
         write_markdown(path, fm, body)
 
+_PROVINCE_BODY = (
+    "# Province %s\n"
+    "%s\n"
+    "State → [[States/State-%s]]\n"
+    "Capital → [[Burgs/Burg-%s]]"
+)
+
+
 def process_provinces(provinces):
     if not isinstance(provinces, list):
         logging.warning("provinces is not a list; skipping province processing")
         return
+    out_prefix = os.path.join(VAULT_DIR, "Provinces", "Province-")
     for p in provinces[1:]:
         try:
             if not isinstance(p, dict):
@@ -569,20 +1235,24 @@ def process_provinces(provinces):
         except Exception as e:
             logging.warning("Skipping province entry due to error: %s", e)
             continue
-        body = (
-            f"# Province {fm['name']}\n"
-            f"{f'![Emblem]({fm['emblem_url']})' if fm['emblem_url'] else ''}\n"
-            f"State → [[States/State-{fm['state']}]]\n"
-            f"Capital → [[Burgs/Burg-{fm['capital_burg']}]]"
+        body = _PROVINCE_BODY % (
+            fm['name'], f"![Emblem]({emblem_url})" if emblem_url else "", fm['state'], fm['capital_burg'],
         )
-        filename = f"Province-{fm['province_id']}-{safe_filename(fm['name'])}.md"
-        path = os.path.join(VAULT_DIR, "Provinces", filename)
+        path = f"{out_prefix}{fm['province_id']}-{safe_filename(fm['name'])}.md"
         write_markdown(path, fm, body)
 
+_CULTURE_BODY = (
+    "# Culture %s\n"
+    "%s\n"
+    "Origins → %s"
+)
+
+
 def process_cultures(cultures):
     if not isinstance(cultures, list):
         logging.warning("cultures is not a list; skipping culture processing")
         return
+    out_prefix = os.path.join(VAULT_DIR, "Cultures", "Culture-")
     for c in cultures[1:]:
         try:
             if not isinstance(c, dict):
@@ -602,19 +1272,24 @@ def process_cultures(cultures):
         except Exception as e:
             logging.warning("Skipping culture entry due to error: %s", e)
             continue
-        body = (
-            f"# Culture {fm['name']}\n"
-            f"{f'![Emblem]({fm['emblem_url']})' if fm['emblem_url'] else ''}\n"
-            f"Origins → {fm['origins']}"
+        body = _CULTURE_BODY % (
+            fm['name'], f"![Emblem]({emblem_url})" if emblem_url else "", fm['origins'],
         )
-        filename = f"Culture-{fm['culture_id']}-{safe_filename(fm['name'])}.md"
-        path = os.path.join(VAULT_DIR, "Cultures", filename)
+        path = f"{out_prefix}{fm['culture_id']}-{safe_filename(fm['name'])}.md"
         write_markdown(path, fm, body)
 
+_RELIGION_BODY = (
+    "# Religion %s\n"
+    "%s\n"
+    "Culture → [[Cultures/Culture-%s]]"
+)
+
+
 def process_religions(religions):
     if not isinstance(religions, list):
         logging.warning("religions is not a list; skipping religion processing")
         return
+    out_prefix = os.path.join(VAULT_DIR, "Religions", "Religion-")
     for r in religions[1:]:
         try:
             if not isinstance(r, dict):
@@ -634,19 +1309,24 @@ def process_religions(religions):
         except Exception as e:
             logging.warning("Skipping religion entry due to error: %s", e)
             continue
-        body = (
-            f"# Religion {fm['name']}\n"
-            f"{f'![Emblem]({fm['emblem_url']})' if fm['emblem_url'] else ''}\n"
-            f"Culture → [[Cultures/Culture-{fm.get('culture', 0)}]]"
+        body = _RELIGION_BODY % (
+            fm['name'], f"![Emblem]({emblem_url})" if emblem_url else "", fm.get('culture', 0),
         )
-        filename = f"Religion-{fm['religion_id']}-{safe_filename(fm['name'])}.md"
-        path = os.path.join(VAULT_DIR, "Religions", filename)
+        path = f"{out_prefix}{fm['religion_id']}-{safe_filename(fm['name'])}.md"
         write_markdown(path, fm, body)
 
+_FEATURE_BODY = (
+    "# Feature %s (%s)\n"
+    "%s\n"
+    "Cells → %s"
+)
+
+
 def process_features(features):
     if not isinstance(features, list):
         logging.warning("features is not a list; skipping feature processing")
         return
+    out_prefix = os.path.join(VAULT_DIR, "Features", "Feature-")
     for f in features[1:]:
         try:
             if not isinstance(f, dict):
@@ -663,19 +1343,24 @@ def process_features(features):
         except Exception as e:
             logging.warning("Skipping feature entry due to error: %s", e)
             continue
-        body = (
-            f"# Feature {fm['feature_id']} ({fm.get('type','')})\n"
-            f"{f'![Emblem]({fm['emblem_url']})' if fm['emblem_url'] else ''}\n"
-            f"Cells → {fm['cells']}"
+        body = _FEATURE_BODY % (
+            fm['feature_id'], fm.get('type', ''), f"![Emblem]({emblem_url})" if emblem_url else "", fm['cells'],
         )
-        filename = f"Feature-{fm['feature_id']}-{safe_filename(fm.get('type',''))}.md"
-        path = os.path.join(VAULT_DIR, "Features", filename)
+        path = f"{out_prefix}{fm['feature_id']}-{safe_filename(fm.get('type',''))}.md"
         write_markdown(path, fm, body)
 
+_RIVER_BODY = (
+    "# River %s\n"
+    "Flows through → %s\n"
+    "Mouth → [[Cells/Cell-%s]]"
+)
+
+
 def process_rivers(rivers):
     if not isinstance(rivers, list):
         logging.warning("rivers is not a list; skipping river processing")
         return
+    out_prefix = os.path.join(VAULT_DIR, "Rivers", "River-")
     for r in rivers:
         try:
             if not isinstance(r, dict):
@@ -691,18 +1376,46 @@ def process_rivers(rivers):
                 "length_km": r.get("length", 0),
                 "flux": r.get("discharge", 0),
             }
-            body = (
-                f"# River {fm['name']}\n"
-                f"Flows through → {fm['cells']}\n"
-                f"Mouth → [[Cells/Cell-{fm['mouth_cell']}]]"
-            )
-            filename = f"River-{fm['river_id']}-{safe_filename(fm['name'])}.md"
-            path = os.path.join(VAULT_DIR, "Rivers", filename)
+            body = _RIVER_BODY % (fm['name'], fm['cells'], fm['mouth_cell'])
+            path = f"{out_prefix}{fm['river_id']}-{safe_filename(fm['name'])}.md"
             write_markdown(path, fm, body)
         except Exception as e:
             logging.warning("Skipping river entry due to error: %s", e)
             continue
 
+# pack key -> processor for each entity list, in output order
+_ENTITY_PROCESSORS = (
+    ("burgs", process_burgs),
+    ("states", process_states),
+    ("provinces", process_provinces),
+    ("cultures", process_cultures),
+    ("religions", process_religions),
+    ("features", process_features),
+    ("rivers", process_rivers),
+)
+
+
+def _process_entities(pack):
+    for key, func in _ENTITY_PROCESSORS:
+        func(pack.get(key, []))
+
+
+def process_pack(pack):
+    """Run every processor over `pack`.
+
+    Cells and the entity lists write to disjoint folders and share no mutable
+    state besides the MarkdownSink, so they run on separate threads: the
+    entity processors (emblems, MFCG copies) overlap with cell formatting
+    instead of waiting for it. The entity processors stay in a fixed order on
+    one thread so shared-emblem dedupe always keeps the same first file.
+    Exceptions from either side are re-raised here.
+    """
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(process_cells, pack), pool.submit(_process_entities, pack)]
+        for future in futures:
+            future.result()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Convert FMG map.json into an Obsidian-style World vault")
     parser.add_argument("mapfile", help="Path to FMG exported JSON (map.json)")
@@ -714,6 +1427,9 @@ if __name__ == "__main__":
     parser.add_argument("--mfcg-map-file", default=None, help="JSON file mapping burg ids/names to relative MFCG paths (used when --mfcg-match=map)")
     parser.add_argument("--mfcg-dedupe", action="store_true", help="Enable deduplication by content (sha256) across vault files for MFCG assets")
     parser.add_argument("--mfcg-zip", action="store_true", help="Package matched MFCG assets into a per-burg ZIP and remove individual copies (saves space)")
+    parser.add_argument("--skip-empty-cells", action="store_true", help="Don't write notes for cells with zero elevation and no burg, state, culture or routes (e.g. open ocean)")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes used to render cells on large maps (default: one per CPU; 1 disables multiprocessing)")
+    parser.add_argument("--bundle", default=None, metavar="PATH", help="Write all Markdown notes into one gzip bundle at PATH instead of separate files (extract with unpack_bundle)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
     args = parser.parse_args()
 
@@ -729,26 +1445,27 @@ if __name__ == "__main__":
     MFCG_MAP_FILE = args.mfcg_map_file
     MFCG_DEDUPE = args.mfcg_dedupe
     MFCG_ZIP = args.mfcg_zip
+    WORKERS = args.workers
+    SKIP_EMPTY_CELLS = args.skip_empty_cells
 
     ensure_vault_dirs(VAULT_DIR)
 
     try:
-        with open(args.mapfile, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_json(args.mapfile)
     except OSError as e:
         logging.error("Failed to open map file %s: %s", args.mapfile, e)
         raise SystemExit(2)
+    except ValueError as e:
+        logging.error("Failed to parse map file %s: %s", args.mapfile, e)
+        raise SystemExit(2)
 
     pack = data.get("pack")
     if not pack:
         logging.error("Input JSON does not contain top-level 'pack' key")
         raise SystemExit(2)
 
-    process_cells(pack)
-    process_burgs(pack.get("burgs", []))
-    process_states(pack.get("states", []))
-    process_provinces(pack.get("provinces", []))
-    process_cultures(pack.get("cultures", []))
-    process_religions(pack.get("religions", []))
-    process_features(pack.get("features", []))
-    process_rivers(pack.get("rivers", []))
\ No newline at end of file
+    if DOWNLOAD_EMBLEMS:
+        prefetch_emblems(pack)
+
+    with (BundleSink(args.bundle) if args.bundle else MarkdownSink()) as MARKDOWN_SINK:
+        process_pack(pack)
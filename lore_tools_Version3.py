@@ -1,5 +1,21 @@
 import random
 
+FESTIVAL_TYPES = ('Harvest', 'Solstice', 'Remembrance', 'Lights', 'Trade')
+FESTIVAL_DESCRIPTORS = ('Grand', 'Silent', 'Ancient', 'Day of', 'Festival of')
+FESTIVAL_DAYS = ('Dawn', 'Lights', 'Plenty', 'Remembrance', 'Wellsprings')
+
+RULER_SURNAMES = ("Ashfall", "Velora", "Silvervein", "Dorn", "Gleam")
+RULER_TITLES = ("Lord", "Lady", "Baron", "Duke", "Chancellor")
+RULER_FIRSTNAMES = ("Gerin", "Mirala", "Edris", "Tharan", "Cyra")
+
+MYTH_SUBJECTS = ("Stag", "Well", "Spirit", "Oak", "Torrent", "Star")
+MYTH_ADJECTIVES = ("Silver", "Endless", "Hollow", "Sacred", "Lost")
+MYTH_LEGENDS = (
+    "The {adj} {subj} guards the town's luck.",
+    "{adj} {subj} appears every century.",
+    "Only the worthy see the {adj} {subj} at dawn."
+)
+
 def random_history(burg_name):
     events = [
         f"{burg_name} was founded after a devastating storm.",
@@ -11,28 +27,20 @@ def random_history(burg_name):
     return random.choice(events)
 
 def random_festival():
-    festival_types = ['Harvest', 'Solstice', 'Remembrance', 'Lights', 'Trade']
-    descriptors = ['Grand', 'Silent', 'Ancient', 'Day of', 'Festival of']
-    days = ['Dawn', 'Lights', 'Plenty', 'Remembrance', 'Wellsprings']
-    return f"{random.choice(descriptors)} {random.choice(random.choice([festival_types, days]))}"
+    return f"{random.choice(FESTIVAL_DESCRIPTORS)} {random.choice(random.choice((FESTIVAL_TYPES, FESTIVAL_DAYS)))}"
 
 def random_rulers():
-    surnames = ["Ashfall", "Velora", "Silvervein", "Dorn", "Gleam"]
-    titles = ["Lord", "Lady", "Baron", "Duke", "Chancellor"]
-    firstnames = ["Gerin", "Mirala", "Edris", "Tharan", "Cyra"]
-    return [f"{random.choice(titles)} {random.choice(firstnames)} {random.choice(surnames)}" for _ in range(random.randint(1, 3))]
+    # Draw every ruler's title/first name/surname in one call per list
+    n = random.randint(1, 3)
+    titles = random.choices(RULER_TITLES, k=n)
+    firstnames = random.choices(RULER_FIRSTNAMES, k=n)
+    surnames = random.choices(RULER_SURNAMES, k=n)
+    return [f"{t} {f} {s}" for t, f, s in zip(titles, firstnames, surnames)]
 
 def random_myth():
-    subjects = ["Stag", "Well", "Spirit", "Oak", "Torrent", "Star"]
-    adjectives = ["Silver", "Endless", "Hollow", "Sacred", "Lost"]
-    legends = [
-        "The {adj} {subj} guards the town's luck.",
-        "{adj} {subj} appears every century.",
-        "Only the worthy see the {adj} {subj} at dawn."
-    ]
-    myth = random.choice(legends).format(
-        adj=random.choice(adjectives),
-        subj=random.choice(subjects)
+    myth = random.choice(MYTH_LEGENDS).format(
+        adj=random.choice(MYTH_ADJECTIVES),
+        subj=random.choice(MYTH_SUBJECTS)
     )
     return myth
 
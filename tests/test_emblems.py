@@ -0,0 +1,102 @@
+import io
+
+import fmg_to_obsidian_Version3 as fmg
+from fmg_to_obsidian_Version3 import save_emblem_svg
+
+
+def test_save_emblem_svg_reuses_identical_svg(tmp_path, monkeypatch):
+    monkeypatch.setattr(fmg, "EMBLEM_DIR", str(tmp_path))
+    svg = "<svg><circle r='1'/></svg>"
+    first = save_emblem_svg("burg", 1, svg)
+    second = save_emblem_svg("burg", 2, svg)
+    other = save_emblem_svg("state", 1, "<svg/>")
+    assert first == second == "emblems/burg-1.svg"
+    assert other == "emblems/state-1.svg"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["burg-1.svg", "state-1.svg"]
+
+
+class _FakeResponse:
+    def __init__(self, body):
+        self.raw = io.BytesIO(body)
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeSession:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, stream=False, timeout=None):
+        self.urls.append(url)
+        return _FakeResponse(url.encode("utf-8"))
+
+
+def test_prefetch_emblems_downloads_once(tmp_path, monkeypatch):
+    session = _FakeSession()
+    monkeypatch.setattr(fmg, "_HTTP_SESSION", session)
+    monkeypatch.setattr(fmg, "EMBLEM_DIR", str(tmp_path))
+    monkeypatch.setattr(fmg, "DOWNLOAD_EMBLEMS", True)
+    monkeypatch.setattr(fmg, "_prefetched_emblems", {})
+    pack = {
+        "burgs": [{}, {"i": 1, "emblem_url": "https://example.test/a.png"},
+                  {"i": 2, "emblem_url": "https://example.test/b.png", "coa": {"svg": "<svg/>"}}],
+        "states": [{}, {"i": 1, "emblem_url": "https://example.test/c.svg"}],
+    }
+    fmg.prefetch_emblems(pack)
+    assert sorted(session.urls) == ["https://example.test/a.png", "https://example.test/c.svg"]
+    assert fmg.get_emblem_for("burg", pack["burgs"][1], 1) == "emblems/burg-1.png"
+    assert fmg.get_emblem_for("state", pack["states"][1], 1) == "emblems/state-1.svg"
+    assert len(session.urls) == 2
+    assert (tmp_path / "burg-1.png").read_bytes() == b"https://example.test/a.png"
+
+
+def test_save_emblem_image_reuses_file_already_in_emblem_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(fmg, "EMBLEM_DIR", str(tmp_path / "emblems"))
+    existing = tmp_path / "emblems" / "burg-3.png"
+    existing.parent.mkdir()
+    existing.write_bytes(b"PNG")
+    src = tmp_path / "src" / "crest.png"
+    src.parent.mkdir()
+    src.write_bytes(b"NEW")
+    assert fmg.save_emblem_image(str(existing), "burg", 3, "png") == "emblems/burg-3.png"
+    assert existing.read_bytes() == b"PNG"
+    assert fmg.save_emblem_image(str(src), "burg", 4, "png") == "emblems/burg-4.png"
+    assert (tmp_path / "emblems" / "burg-4.png").read_bytes() == b"NEW"
+
+
+def test_shared_emblem_sources_are_copied_once(tmp_path, monkeypatch):
+    session = _FakeSession()
+    monkeypatch.setattr(fmg, "_HTTP_SESSION", session)
+    monkeypatch.setattr(fmg, "EMBLEM_DIR", str(tmp_path / "emblems"))
+    monkeypatch.setattr(fmg, "DOWNLOAD_EMBLEMS", True)
+    monkeypatch.setattr(fmg, "_prefetched_emblems", {})
+    monkeypatch.setattr(fmg, "_local_emblem_cache", {})
+    (tmp_path / "emblems").mkdir()
+    crest = tmp_path / "crest.png"
+    crest.write_bytes(b"PNG")
+    url = "https://example.test/shared.svg"
+    pack = {"states": [{}, {"i": 1, "emblem_url": url}, {"i": 2, "emblem_url": url}]}
+    fmg.prefetch_emblems(pack)
+    assert session.urls == [url]
+    assert fmg.get_emblem_for("state", pack["states"][2], 2) == "emblems/state-1.svg"
+    assert fmg.save_emblem_image(str(crest), "burg", 1) == "emblems/burg-1.png"
+    assert fmg.save_emblem_image(str(crest), "burg", 2) == "emblems/burg-1.png"
+    assert sorted(p.name for p in (tmp_path / "emblems").iterdir()) == ["burg-1.png", "state-1.svg"]
+
+
+class _DroppedRaw(io.BytesIO):
+    def read(self, *args, **kwargs):
+        from urllib3.exceptions import ProtocolError
+        raise ProtocolError("IncompleteRead")
+
+
+def test_interrupted_download_is_logged_and_skipped(tmp_path, monkeypatch):
+    response = _FakeResponse(b"")
+    response.raw = _DroppedRaw()
+    session = _FakeSession()
+    monkeypatch.setattr(session, "get", lambda url, **kw: response)
+    monkeypatch.setattr(fmg, "_HTTP_SESSION", session)
+    monkeypatch.setattr(fmg, "EMBLEM_DIR", str(tmp_path))
+    assert fmg.save_emblem_image("https://example.test/a.png", "burg", 1, "png", download=True) == ""
+    assert list(tmp_path.iterdir()) == []
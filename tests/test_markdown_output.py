@@ -0,0 +1,147 @@
+import os
+
+import pytest
+
+try:
+    import yaml
+except ImportError:  # only the PyYAML round-trip checks need it
+    yaml = None
+
+requires_yaml = pytest.mark.skipif(yaml is None, reason="PyYAML not installed")
+
+import fmg_to_obsidian_Version3 as fmg
+from fmg_to_obsidian_Version3 import write_markdown
+
+
+@requires_yaml
+def test_fast_yaml_dump_round_trips_through_pyyaml():
+    fm = {
+        "name": "Burg 2: Ö'town",
+        "plain": "Stonehaven",
+        "reserved": "yes",
+        "numeric_text": "0123",
+        "empty": "",
+        "padded": " x ",
+        "multiline": "a\nb",
+        "leading_comma": ",foo",
+        "merge_key": "<<",
+        "control_chars": "a\x7fb\x85c\u2028d\ufeffe",
+        "bare_nel": "\x85x",
+        "flag": False,
+        "count": 3,
+        "ratio": 1e-05,
+        "missing": None,
+        "items": [1, "two", [3, 4], {"k": "v"}],
+        "floats": [1e-05, 1e16, 2.5, {"inf": float("inf")}],
+        "routes": {"12": {"13": 1}, "5": []},
+        "no_items": [],
+        "no_routes": {},
+    }
+    text = fmg._fast_yaml_dump(fm)
+    assert yaml.safe_load(text) == fm
+    assert 'items: [1,"two",[3,4],{"k":"v"}]\n' in text
+    assert 'floats: [1.0e-05,1.0e+16,2.5,{"inf":.inf}]\n' in text
+    assert fmg._json_flow([float("nan")]) == "[.nan]"
+
+
+def test_write_markdown_layout(tmp_path):
+    path = tmp_path / "Cell-1.md"
+    write_markdown(str(path), {"cell_id": 1, "routes": {}}, "# Cell 1\n")
+    assert path.read_text(encoding="utf-8") == "---\ncell_id: 1\nroutes: {}\n---\n\n# Cell 1\n"
+
+
+def test_markdown_sink_writes_all_files_on_exit(tmp_path):
+    old_sink = fmg.MARKDOWN_SINK
+    try:
+        # tiny batch size so several flushes happen before close
+        with fmg.MarkdownSink(max_bytes=64) as sink:
+            fmg.MARKDOWN_SINK = sink
+            for i in range(20):
+                write_markdown(str(tmp_path / f"Cell-{i}.md"), {"cell_id": i}, f"# Cell {i}\n")
+    finally:
+        fmg.MARKDOWN_SINK = old_sink
+    for i in range(20):
+        assert (tmp_path / f"Cell-{i}.md").read_text(encoding="utf-8").endswith(f"# Cell {i}\n")
+
+
+def test_markdown_sink_raises_on_close_when_writes_fail(tmp_path):
+    missing = tmp_path / "missing" / "Cells"
+    with pytest.raises(OSError, match="Failed to write 3 Markdown file"):
+        with fmg.MarkdownSink(max_bytes=1) as sink:
+            for i in range(3):
+                sink.submit(str(missing / f"Cell-{i}.md"), b"# Cell\n")
+
+
+def test_bundle_sink_round_trips_through_unpack_bundle(tmp_path):
+    vault = tmp_path / "vault"
+    bundle = tmp_path / "notes.bundle.gz"
+    with fmg.BundleSink(str(bundle), vault_dir=str(vault)) as sink:
+        sink.submit(os.path.join(str(vault), "Cells", "Cell-1.md"), b"# Cell 1\n")
+        sink.submit(os.path.join(str(vault), "Burgs", "Burg-2-Köln.md"), "# Köln\n".encode("utf-8"))
+    assert not vault.exists()
+    out = tmp_path / "out"
+    assert fmg.unpack_bundle(str(bundle), str(out)) == 2
+    assert (out / "Cells" / "Cell-1.md").read_bytes() == b"# Cell 1\n"
+    assert (out / "Burgs" / "Burg-2-Köln.md").read_text(encoding="utf-8") == "# Köln\n"
+
+
+def _run_process_cells(vault, workers, min_cells, pack=None):
+    if pack is None:
+        pack = {"cells": {"h": [0, 10, 20], "x": [0, 1.5, 2], "y": [0, 1, 2], "burg": [0, 1, 0], "routes": {}}}
+    (vault / "Cells").mkdir(parents=True)
+    old = (fmg.VAULT_DIR, fmg.WORKERS, fmg.PARALLEL_MIN_CELLS)
+    try:
+        fmg.VAULT_DIR, fmg.WORKERS, fmg.PARALLEL_MIN_CELLS = str(vault), workers, min_cells
+        fmg.process_cells(pack)
+    finally:
+        fmg.VAULT_DIR, fmg.WORKERS, fmg.PARALLEL_MIN_CELLS = old
+    return {p.name: p.read_bytes() for p in (vault / "Cells").iterdir()}
+
+
+def test_process_cells_pool_matches_serial(tmp_path):
+    serial = _run_process_cells(tmp_path / "serial", 1, 1)
+    pooled = _run_process_cells(tmp_path / "pooled", 2, 1)
+    assert sorted(serial) == ["Cell-0.md", "Cell-1.md", "Cell-2.md"]
+    assert pooled == serial
+
+
+def test_cell_column_pads_and_coerces():
+    cells = {"h": [1, "2", None], "x": {1: 2}}
+    assert fmg._cell_column(cells, "h", 4, int, 0) == [1, 2, 0, 0]
+    assert fmg._cell_column(cells, "x", 3, float, 0.0) == [0.0, 2.0, 0.0]
+    assert fmg._cell_column(cells, "missing", 2, int, 0) == [0, 0]
+
+
+@requires_yaml
+def test_render_cell_template_matches_generic_writer():
+    row = (7, 1.5, 1e-05, 3, 1, 2, 0, 4, 5, 6, 1, 9.25, 0, 12, 0, {"8": 1})
+    cid, payload = fmg._render_cell(row)
+    assert cid == 7
+    _, frontmatter, body = payload.decode("utf-8").split("---\n", 2)
+    assert yaml.safe_load(frontmatter) == {
+        "cell_id": 7, "x": 1.5, "y": 1e-05, "elevation": 3, "feature": 1,
+        "biome": 2, "burg": 0, "culture": 4, "state": 5, "province": 6,
+        "religion": 1, "population": 9.25, "river": 0, "flux": 12,
+        "harbor_score": 0, "routes": {"8": 1},
+    }
+    assert body.startswith("\n# Cell 7\nLinks → [[Features/Feature-1]]")
+
+
+def test_cell_column_fallback_keeps_good_values():
+    cells = {"h": [1.9, float("inf"), "x", True, 4]}
+    assert fmg._cell_column(cells, "h", 5, int, 0) == [1, 0, 0, 1, 4]
+    assert fmg._cell_column({"x": [1, 10**400, "bad"]}, "x", 3, float, 0.0) == [1.0, 0.0, 0.0]
+
+
+def test_process_cells_skips_empty_cells(tmp_path, monkeypatch):
+    monkeypatch.setattr(fmg, "SKIP_EMPTY_CELLS", True)
+    pack = {"cells": {"h": [0, 0, 5, 0], "burg": [0, 2, 0, 0], "routes": {3: {"4": 1}}}}
+    written = _run_process_cells(tmp_path, 1, 1, pack)
+    assert sorted(written) == ["Cell-1.md", "Cell-2.md", "Cell-3.md"]
+
+
+def test_safe_filename_collapses_whitespace_and_replaces_unsafe_chars():
+    assert fmg.safe_filename("  Köln  am\tRhein! ") == "K_ln_am_Rhein"
+    assert fmg.safe_filename("-_ a.b-c _-") == "a.b-c"
+    assert fmg.safe_filename("@@@") == "unnamed"
+    assert fmg.safe_filename("", fallback="x") == "x"
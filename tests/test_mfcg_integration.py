@@ -202,3 +202,86 @@ def test_integrate_mfcg_returns_empty_for_missing_root(tmp_path):
     vault = tmp_path / "vault"
     copied = integrate_mfcg_assets(99, "Nope", str(tmp_path / 'no_exist_root'), str(vault))
     assert copied == []
+
+
+def test_integrate_mfcg_uses_prescanned_entries(tmp_path, monkeypatch):
+    mfcg_root = tmp_path / "mfcg_root"
+    make_file(mfcg_root / "Burg-7-Ashford" / "index.html", "<html/>")
+    make_file(mfcg_root / "burg-7-map.png", "PNG")
+    monkeypatch.setattr(fmg, "MFCG_MATCH_MODE", "fuzzy")
+    entries = fmg.scan_mfcg_root(str(mfcg_root))
+
+    def no_rescan(path):
+        raise AssertionError("MFCG root listed again")
+
+    monkeypatch.setattr(fmg, "scan_mfcg_root", no_rescan)
+    copied = integrate_mfcg_assets(7, "Ashford", str(mfcg_root), str(tmp_path / "vault"), entries)
+    assert sorted(copied) == [
+        "Burgs/Burg-7-Ashford/mfcg/Burg-7-Ashford/index.html",
+        "Burgs/Burg-7-Ashford/mfcg/burg-7-map.png",
+    ]
+
+
+def test_integrate_mfcg_exact_mode_uses_name_index(tmp_path, monkeypatch):
+    mfcg_root = tmp_path / "mfcg_root"
+    make_file(mfcg_root / "burg-8" / "index.html", "<html/>")
+    make_file(mfcg_root / "burg-80" / "index.html", "<html/>")
+    make_file(mfcg_root / "Marsh", "data")
+    monkeypatch.setattr(fmg, "MFCG_MATCH_MODE", "exact")
+    entries = fmg.scan_mfcg_root(str(mfcg_root))
+    index = fmg.index_mfcg_entries(entries)
+    vault = tmp_path / "vault"
+    copied = integrate_mfcg_assets(8, "Marsh", str(mfcg_root), str(vault), entries, index)
+    assert sorted(copied) == ["Burgs/Burg-8-Marsh/mfcg/Marsh", "Burgs/Burg-8-Marsh/mfcg/burg-8/index.html"]
+
+
+def test_integrate_mfcg_falls_back_when_copytree_fails(tmp_path, monkeypatch):
+    mfcg_root = tmp_path / "mfcg_root"
+    make_file(mfcg_root / "Burg-9-Fenwick" / "b" / "two.txt", "2")
+    make_file(mfcg_root / "Burg-9-Fenwick" / "a" / "one.txt", "1")
+
+    def failing_copytree(*args, **kwargs):
+        raise OSError("copytree unavailable")
+
+    monkeypatch.setattr(fmg.shutil, "copytree", failing_copytree)
+    copied = integrate_mfcg_assets(9, "Fenwick", str(mfcg_root), str(tmp_path / "vault"))
+    base = "Burgs/Burg-9-Fenwick/mfcg/Burg-9-Fenwick"
+    assert sorted(copied) == [f"{base}/a/one.txt", f"{base}/b/two.txt"]
+    assert (tmp_path / "vault" / base / "b" / "two.txt").read_text(encoding="utf-8") == "2"
+
+
+def test_mfcg_map_file_is_parsed_once(tmp_path, monkeypatch):
+    mapfile = tmp_path / "map.json"
+    mapfile.write_text(json.dumps({"1": ["a.txt"]}), encoding="utf-8")
+    calls = []
+    real_load = fmg.load_json
+
+    def counting_load(path):
+        calls.append(path)
+        return real_load(path)
+
+    monkeypatch.setattr(fmg, "load_json", counting_load)
+    assert fmg._load_mfcg_map(str(mapfile)) == {"1": ["a.txt"]}
+    assert fmg._load_mfcg_map(str(mapfile)) == {"1": ["a.txt"]}
+    assert len(calls) == 1
+    assert fmg._load_mfcg_map(str(tmp_path / "missing.json")) is None
+
+
+def test_iter_files_matches_os_walk(tmp_path):
+    for rel in ("a.txt", "x/b.txt", "x/y/c.txt", "z/d.txt", "x/e.txt"):
+        make_file(tmp_path / rel)
+    walked = [os.path.join(root, f) for root, _, files in os.walk(tmp_path) for f in files]
+    assert list(fmg._iter_files(str(tmp_path))) == walked
+    assert list(fmg._iter_files(str(tmp_path / "missing"))) == []
+
+
+def test_integrate_mfcg_lists_assets_in_the_same_order_on_rerun(tmp_path):
+    mfcg_root = tmp_path / "mfcg_root"
+    for i in range(1, 5):
+        make_file(mfcg_root / "Burg-5-Oak" / f"d{i}" / "in.txt")
+        make_file(mfcg_root / "Burg-5-Oak" / f"f{i}.txt")
+    vault = tmp_path / "vault"
+    first = integrate_mfcg_assets(5, "Oak", str(mfcg_root), str(vault))
+    second = integrate_mfcg_assets(5, "Oak", str(mfcg_root), str(vault))
+    assert len(first) == 8
+    assert first == second